@@ -1,14 +1,34 @@
 from fastapi import FastAPI
 from pydantic import BaseModel
 from prospect_cleaner.services.prospect_cleaner import ProspectDataCleaner
+from prospect_cleaner.settings import settings, aclose_shared_client
 from prospect_cleaner.logconf import logger
 import asyncio
+from functools import lru_cache
 from pathlib import Path
 
 app = FastAPI()
 
+@app.on_event("shutdown")
+async def _close_llm_client() -> None:
+    await aclose_shared_client()
+
 from typing import Optional
 
+@lru_cache(maxsize=None)
+def _get_cleaner(nom_col: str, prenom_col: str, entreprise_col: str, email_col: str) -> ProspectDataCleaner:
+    """
+    One cleaner per column configuration, reused across requests so the
+    shared OpenAI client keeps its warm connection pool instead of
+    rebuilding state per HTTP call.
+    """
+    return ProspectDataCleaner(
+        nom_col=nom_col,
+        prenom_col=prenom_col,
+        entreprise_col=entreprise_col,
+        email_col=email_col,
+    )
+
 class CleanRequest(BaseModel):
     input_path: str
     output_path: str
@@ -19,17 +39,12 @@ class CleanRequest(BaseModel):
 
 @app.post("/clean_prospects/")
 async def clean_prospects_endpoint(request: CleanRequest):
-    cleaner_args = {}
-    if request.nom_col:
-        cleaner_args["nom_col"] = request.nom_col
-    if request.prenom_col:
-        cleaner_args["prenom_col"] = request.prenom_col
-    if request.entreprise_col:
-        cleaner_args["entreprise_col"] = request.entreprise_col
-    if request.email_col:
-        cleaner_args["email_col"] = request.email_col
-
-    cleaner = ProspectDataCleaner(**cleaner_args)
+    cleaner = _get_cleaner(
+        request.nom_col or settings.default_nom_col,
+        request.prenom_col or settings.default_prenom_col,
+        request.entreprise_col or settings.default_entreprise_col,
+        request.email_col or settings.default_email_col,
+    )
     try:
         # Ensure paths are valid Path objects
         input_p = Path(request.input_path)
@@ -1,44 +1,196 @@
+import asyncio
 import json
 import re
-import math
+from functools import lru_cache
+from pathlib import Path
 from typing import List, Tuple
+import orjson
+import pandas as pd
 from openai import AsyncOpenAI
+from pydantic import BaseModel, Field, field_validator
 from prospect_cleaner.models.validation_result import ValidationResult
-from prospect_cleaner.settings import settings
+from prospect_cleaner.settings import settings, shared_client, shared_sem
 from prospect_cleaner.logconf import logger
+from prospect_cleaner.utils.async_utils import llm_retry
+from prospect_cleaner.utils.llm_cache import llm_cache
+
+__all__ = ["CompanyValidator"]
+
+# compiled once — these run on every row of a CSV
+# one alternation instead of six sequential passes; \b keeps "SA" from
+# eating the start of a following word ("Acme SA Ventures" vs "Acme Savoy")
+_SUFFIX_RE = re.compile(
+    r"\s+(?:SARL|SASU|SAS|SA|EURL|SNC|SCI|SCP|SCOP|SELARL|SELASU|SELAS|SEL"
+    r"|AG|GmbH|KG|OHG|GbR|UG"
+    r"|Limited|Ltd|LLC|Incorporated|Inc|Corporation|Corp|Company|Co"
+    r"|BV|NV|VOF|CV"
+    r"|SpA|Srl"
+    r"|AB|HB|KB)\b\.?",
+    re.IGNORECASE,
+)
+_TM_RE = re.compile(r"[,\s]+[®™©]")
+_PAREN_RE = re.compile(r"\s*\([^)]+\)$")
+
+# drops every ASCII char outside [a-z0-9]
+_NON_ALNUM_TBL = str.maketrans(
+    "", "",
+    "".join(chr(c) for c in range(128) if not ("a" <= chr(c) <= "z" or "0" <= chr(c) <= "9")),
+)
+
+
+def _alnum_key(s: str) -> str:
+    """
+    Lowercase ASCII alphanumerics only, e.g. "Swiss Re AG" → "swissreag".
+    str.translate + ascii-ignore run in C and replace the old
+    re.sub(r"[^a-z0-9]", ...) on the domain-match hot path.
+    """
+    return s.lower().encode("ascii", "ignore").decode("ascii").translate(_NON_ALNUM_TBL)
 
-class CompanyValidator:
+
+@lru_cache(maxsize=50_000)
+def _basic_clean(name: str) -> str:
     """
-    Validates / normalises company names.
+    Strip trailing parentheticals, trademark glyphs and legal suffixes.
+    Pure function of its input, so results are memoized: the same company
+    string is cleaned several times per row (known-brand lookup, fallback
+    branches), and whole CSVs repeat the same few employers.
+    """
+    cleaned = _PAREN_RE.sub("", name.strip())
+    cleaned = _TM_RE.sub("", cleaned)
+    cleaned = _SUFFIX_RE.sub("", cleaned)
+    return " ".join(cleaned.split()) or name
 
-    ✱ Uses the OpenAI Response API with the web-search preview tool
-    ✱ Keeps citations + long French explanation
+class _LLMAnswer(BaseModel):
+    """
+    Typed view of one LLM answer. pydantic's compiled core validates and
+    coerces the whole dict in one pass, replacing the chained .get() /
+    isinstance() / float() checks that used to guard every field access.
+    Extra keys (e.g. the echoed batch "index") are ignored.
     """
+    nom_commercial: str = ""
+    confidence: float = 0.5
+    explication: str = "Explication non fournie par l'IA."
+    changement_nom: bool = False
+    entreprise_connue: bool = False
+    citations: list[str] = Field(default_factory=list)
+
+    @field_validator("citations", mode="before")
+    @classmethod
+    def _keep_str_urls(cls, v):
+        # same filtering the old code did by hand: non-list → no citations,
+        # non-string entries dropped
+        return [c for c in v if isinstance(c, str)] if isinstance(v, list) else []
+
+
+# Well-known corporate email domains → public trade name; matching rows skip
+# the LLM entirely. Keyed by the first label of the domain ("microsoft" for
+# microsoft.com / microsoft.ch). Freemail providers (gmail, outlook, …) are
+# deliberately absent: a personal mailbox says nothing about the employer.
+_DOMAIN_BRAND: dict[str, str] = {
+    "microsoft":    "Microsoft",
+    "google":       "Google",
+    "apple":        "Apple",
+    "amazon":       "Amazon",
+    "meta":         "Meta",
+    "ibm":          "IBM",
+    "oracle":       "Oracle",
+    "sap":          "SAP",
+    "salesforce":   "Salesforce",
+    "accenture":    "Accenture",
+    "deloitte":     "Deloitte",
+    "pwc":          "PwC",
+    "kpmg":         "KPMG",
+    "ey":           "EY",
+    "nestle":       "Nestlé",
+    "novartis":     "Novartis",
+    "roche":        "Roche",
+    "ubs":          "UBS",
+    "swisscom":     "Swisscom",
+    "migros":       "Migros",
+    "coop":         "Coop",
+    "swissre":      "Swiss Re",
+    "zurich":       "Zurich Insurance",
+    "richemont":    "Richemont",
+    "logitech":     "Logitech",
+}
 
-    def __init__(self, client: AsyncOpenAI | None = None) -> None:
-        self._client = client or (
-            AsyncOpenAI(api_key=settings.openai_api_key)
-            if settings.openai_api_key else None
-        )
+# Curated public trade names shipped with the package: inputs whose cleaned
+# form already is a well-known brand resolve locally, without LLM latency
+# or cost. Keyed by lowercase, values keep the canonical spelling.
+_KNOWN_BRANDS_PATH = Path(__file__).resolve().parents[1] / "data" / "known_brands.txt"
+
+
+def _load_known_brands() -> dict[str, str]:
+    try:
+        text = _KNOWN_BRANDS_PATH.read_text(encoding="utf-8")
+    except OSError as exc:
+        logger.warning("known_brands.txt introuvable, lookup local désactivé: %s", exc)
+        return {}
+    return {
+        line.strip().lower(): line.strip()
+        for line in text.splitlines()
+        if line.strip() and not line.lstrip().startswith("#")
+    }
+
+
+_KNOWN_BRANDS = _load_known_brands()
+
+# Structured outputs: the model is constrained to valid JSON of exactly this
+# shape, so chat-completion answers never need the fence-strip fallback and
+# orjson.loads succeeds on the first try.
+_COMPANY_SCHEMA_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "CompanyValidation",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "nom_commercial":    {"type": "string"},
+                "confidence":        {"type": "number"},
+                "explication":       {"type": "string"},
+                "changement_nom":    {"type": "boolean"},
+                "entreprise_connue": {"type": "boolean"},
+                "citations":         {"type": "array", "items": {"type": "string"}},
+            },
+            "required": ["nom_commercial", "confidence", "explication",
+                         "changement_nom", "entreprise_connue", "citations"],
+            "additionalProperties": False,
+        },
+        "strict": True,
+    },
+}
 
-    async def validate(self, company_input: str, email_domain: str = "") -> ValidationResult:
-        # Ensure company_input is a string and cleaned up
-        if not isinstance(company_input, str):
-            # Convert potential NaN (float) or None to empty string or "nan"
-            company_input_str = str(company_input) if company_input is not None else ""
-            if company_input_str.lower() == "nan": # Check for "nan" string irrespective of case
-                company_input_str = "" # Treat actual "nan" strings (from NaN floats) as empty
-        else:
-            company_input_str = company_input
+# Prompt scaffolding is identical for every call, so the message dicts are
+# built once at import instead of per request. Only the final user turn
+# carries per-call data, filled into this template.
+_USER_TMPL = 'Entreprise: "{c}", Domaine email: "{d}"'
 
-        company_input_str = company_input_str.strip()
+_FAST_SYSTEM_MSG = {
+    "role": "system",
+    "content": """
+# Identity
+You are an expert in global companies and commercial brands.
 
-        if not self._client or not company_input_str: # Check after ensuring it's a string
-            # Pass original company_input for the first field of ValidationResult for fidelity
-            return ValidationResult(company_input, company_input_str, 0.0, "no_llm")
+# Instructions
+- From your own knowledge only (no browsing), identify the company's primary public trade name.
+- Ignore legal suffixes (SARL, SA, AG, etc.); prefer the publicly used trade name over the registered legal name.
+- Evaluate confidence (0-1): certainty of identification, match with the email domain, how well-known the name is.
+- If you do not confidently recognise the company, return the cleaned input name with confidence < 0.3 and `entreprise_connue: false`.
+- Do not guess or invent names. All `explication` strings MUST be in French.
+- Respond with a single JSON object:
 
-        # All further processing uses company_input_str
-        messages = [
+{
+    "nom_commercial": "string",
+    "confidence": 0.95,
+    "explication": "string (in French)",
+    "changement_nom": false,
+    "entreprise_connue": true,
+    "citations": []
+}
+""",
+}
+
+_DEEP_BASE_MESSAGES = (
             {
                 "role": "developer",
                 "content": """
@@ -107,80 +259,110 @@ JSON Schema:
 }
 ```"""
             },
-            {
-                "role": "user",
-                "content": 'Entreprise: "Fantomas Widgets Introuvables SA", Domaine email: "contact@fantomas.xyz"'
-            },
-            {
-                "role": "assistant",
-                "content": """\
-```json
+)
+
+_BATCH_DEVELOPER_MSG = {
+    "role": "developer",
+    "content": """
+# Identity
+You are an expert in global companies and commercial brands.
+
+# Instructions
+- For EACH entry of the input JSON array, identify the company's primary public trade name (web search allowed).
+- Ignore legal suffixes (SARL, SA, AG, etc.); prefer the publicly used trade name over the registered legal name.
+- Evaluate confidence (0-1): certainty of identification, match with the email domain, how well-known the name is.
+- If no public trade name can be confidently identified, return the cleaned input name with confidence < 0.3 and `entreprise_connue: false`.
+- Do not guess or invent names. All `explication` strings MUST be in French.
+- **Your entire response MUST be a single valid JSON object** with exactly one result per input entry, same order:
+
 {
-    "nom_commercial": "Fantomas Widgets Introuvables",
-    "confidence": 0.1,
-    "explication": "L'entreprise 'Fantomas Widgets Introuvables SA' et son nom commercial public n'ont pas pu être identifiés de manière fiable. Le nom fourni a été nettoyé des suffixes légaux.",
-    "changement_nom": false,
-    "entreprise_connue": false,
-    "citations": []
+    "results": [
+        {
+            "index": 0,
+            "nom_commercial": "string",
+            "confidence": 0.95,
+            "explication": "string (in French)",
+            "changement_nom": false,
+            "entreprise_connue": true,
+            "citations": ["https://example.com"]
+        }
+    ]
+}
+""",
 }
-```"""
-            },
-            {
-                "role": "user",
-                "content": (
-                    f'Entreprise: "{company_input_str}", ' # Use the cleaned string version
-                    f'Domaine email: "{email_domain if email_domain and email_domain != "nan" else "Non fourni"}"'
-                )
-            }
-        ]
 
-        try:
-            response = await self._client.responses.create(
-                model="gpt-4.1-mini",
-                tools=[{
-                    "type": "web_search_preview",
-                    "user_location": {"type": "approximate", "country": "CH"},
-                }],
-                input=messages,
-            )
+class CompanyValidator:
+    """
+    Validates / normalises company names.
 
-            # === DÉBOGAGE : imprime la réponse brute ===
-            print("=== [DEBUG] response.output_text ===")
-            print(response.output_text)
-            # print("=== [DEBUG] response.output JSON blocks ===") # No longer have separate JSON blocks
-
-            data = {}
-            explanation = "Failed to parse LLM response or extract key information."
-            urls = []
-
-            try:
-                raw_txt = response.output_text.strip()
-                # Attempt to extract JSON even if there's leading/trailing text,
-                # though ideally the LLM returns JSON only as per the updated prompt.
-                match = re.search(r"```json\s*(\{.*?\})\s*```", raw_txt, re.DOTALL)
-                if match:
-                    json_str = match.group(1)
-                else:
-                    # Assume the raw_txt is the JSON itself if no markdown block is found
-                    json_str = raw_txt
+    ✱ Cheap chat-completion first pass; escalates to the Response API
+      web-search preview tool only on low confidence
+    ✱ Keeps citations + long French explanation
+    """
 
-                data = json.loads(json_str)
-                print("=== [DEBUG] JSON parsé ===")
-                print(data)
+    # below this fast-pass confidence, escalate to the web-search pass
+    _ESCALATION_THRESHOLD = 0.7
 
-                explanation = data.get("explication", "Explication non fournie par l'IA.")
-                raw_citations = data.get("citations", [])
-                if isinstance(raw_citations, list):
-                    urls = [str(c) for c in raw_citations if isinstance(c, str)]
-                else:
-                    urls = [] # or handle as an error/warning
+    # with cascade (the default) the fast pass runs on the fast model; the
+    # existing escalation re-asks the main web-search pass whenever the
+    # cheap answer is unsure, so only the hard ~20% pays full latency/cost
+    _MODEL      = settings.openai_model
+    _MODEL_FAST = settings.openai_model_fast
 
-            except Exception as e:
-                print(f"[DEBUG] échec json.loads sur output_text: {e}")
-                # data remains {}
-                explanation = f"Erreur de parsing JSON: {e}"
+    def __init__(self, client: AsyncOpenAI | None = None, cascade: bool = True) -> None:
+        self._client = client or shared_client
+        self._cascade = cascade
 
-            citation_str = ";".join(urls) if urls else ""
+    async def validate(self, company_input: str, domain_key: str = "") -> ValidationResult:
+        # `domain_key` is the normalized first label of the email domain
+        # ("hublead" for jane@hublead.ch), precomputed vectorized by the
+        # caller on the CSV path.
+        # Ensure company_input is a string and cleaned up
+        if not isinstance(company_input, str):
+            # Convert potential NaN (float) or None to empty string or "nan"
+            company_input_str = str(company_input) if company_input is not None else ""
+            if company_input_str.lower() == "nan": # Check for "nan" string irrespective of case
+                company_input_str = "" # Treat actual "nan" strings (from NaN floats) as empty
+        else:
+            company_input_str = company_input
+
+        company_input_str = company_input_str.strip()
+
+        # known corporate domain or curated brand → no LLM call at all
+        hit = self._local_lookup(company_input, domain_key)
+        if hit is not None:
+            return hit
+
+        if not self._client or not company_input_str: # Check after ensuring it's a string
+            # Pass original company_input for the first field of ValidationResult for fidelity
+            return ValidationResult(company_input, company_input_str, 0.0, "no_llm")
+
+        cache_key = f"company|{company_input_str.casefold()}|{(domain_key or '').casefold()}"
+
+        async def _resolve() -> dict:
+            # cheap first pass; escalate to the web-search pass only when needed
+            payload = await self._fast_validate(company_input_str, domain_key)
+            ans = _LLMAnswer.model_validate(payload["data"])
+            if (
+                not ans.nom_commercial
+                or ans.confidence < self._ESCALATION_THRESHOLD
+                or not ans.entreprise_connue
+            ):
+                payload = await self._deep_validate(company_input_str, domain_key)
+            return payload
+
+        try:
+            payload = await llm_cache.get_or_create(
+                cache_key, _resolve,
+                # only persist answers where the LLM produced a trade name;
+                # parse failures and fallbacks should be retried on rerun
+                cache_if=lambda p: bool(p["data"].get("nom_commercial")),
+            )
+            data = payload["data"]
+            explanation = payload["explanation"]
+            urls = payload["urls"]
+
+            citation_str = ";".join(urls)
 
             if "nom_commercial" not in data or not data.get("nom_commercial"):
                 cleaned_name = self._basic_clean(company_input_str) # Use cleaned string
@@ -192,192 +374,412 @@ JSON Schema:
                 if not data.get("nom_commercial") and "nom_commercial" in data : # specifically if nom_commercial was empty
                     final_explanation = "Nom commercial non fourni par l'IA, utilisation du nom nettoyé."
 
-                print(f"[DEBUG] fallback basic clean → '{cleaned_name}', conf={conf}, explanation: {final_explanation}")
+                logger.debug("fallback basic clean → '%s', conf=%s, explanation: %s",
+                             cleaned_name, conf, final_explanation)
                 return ValidationResult(
                     company_input, cleaned_name, conf, # original_input is company_input
                     citation_str, final_explanation
                 )
 
-            nom_final = data["nom_commercial"]
-            base_conf = float(data.get("confidence", 0.5)) # LLM's self-assessed confidence
+            out = _LLMAnswer.model_validate(data)
+            nom_final = out.nom_commercial
 
             # Signaux additionnels pour calibration
-            # urls list is already populated from JSON data's "citations"
-            domain = re.sub(r"[^a-z0-9]", "",
-                            (email_domain or "").lower().split("@")[-1].split(".")[0])
-            # Check if the (cleaned) domain appears in the (cleaned) final name
-            cleaned_nom_final_for_domain_check = re.sub(r"[^a-z0-9]", "", nom_final.lower())
-            domain_ok = bool(domain and domain in cleaned_nom_final_for_domain_check)
-
-            # `entreprise_connue` comes from the JSON, default to True if missing (conservative)
-            # but prompt now guides LLM to set this, if it's missing, it's more likely an issue.
-            # Let's default to unknown (True for unknown_flag) if not present.
-            unknown_flag = not data.get("entreprise_connue", False) # If 'entreprise_connue':false, unknown_flag = true
-
-            confidence = self._calibrate(base_conf, len(urls), domain_ok, unknown_flag)
+            # Check if the precomputed domain key appears in the (cleaned) final name
+            domain_ok = bool(domain_key and domain_key in _alnum_key(nom_final))
+
+            # missing `entreprise_connue` is treated as unknown (unknown_flag True)
+            confidence = self._calibrate(out.confidence, len(urls), domain_ok,
+                                         not out.entreprise_connue)
             return ValidationResult(company_input, nom_final, confidence, citation_str, explanation) # original_input is company_input
 
+        except TimeoutError:
+            logger.warning("Company LLM timeout for '%s' after %.0fs",
+                           company_input_str, settings.openai_timeout)
+            cleaned = self._basic_clean(company_input_str)
+            return ValidationResult(
+                company_input, cleaned, 0.2, "timeout",
+                "Délai de validation dépassé, nettoyage local appliqué.",
+            )
         except Exception as e:
             logger.error("Company LLM error during validation call for '%s': %s", company_input_str, e, exc_info=True) # Log cleaned string
             cleaned = self._basic_clean(company_input_str) # Use cleaned string
             return ValidationResult(company_input, cleaned, 0.3, "error", "exception fallback") # original_input is company_input
 
-        messages = [
-            {
-                "role": "developer",
-                "content": """
-# Identity
-You are an expert in global companies and commercial brands.
-
-# Instructions
-- Always perform a web search to identify the company.
-- Ignore legal suffixes (SARL, SA, AG, etc.) when searching.
-- Return the current publicly used trade name.
-- If recently renamed, use the new name.
-- For subsidiaries, use the main brand unless distinct.
-- Evaluate confidence (0-1) on:
-    • Certainty of identification
-    • Match with email domain
-    • Whether it’s well-known
-- If not found, use the cleaned input name for `nom_commercial` and provide an explanation.
-- Preserve special characters.
-- Do not guess or invent.
-- All textual explanations (`explication`) MUST be in French.
-- You MUST return *only* a JSON object. Do not include any other text or explanations outside the JSON structure. The JSON object should conform to this schema:
+    def _local_lookup(self, company_input, domain_key: str) -> ValidationResult | None:
+        """Resolve without any LLM call: known corporate domain, then the
+        curated brand list applied to the cleaned input name."""
+        hit = self._domain_lookup(company_input, domain_key)
+        if hit is not None:
+            return hit
+        if not isinstance(company_input, str) or not company_input.strip():
+            return None
+        cand = self._basic_clean(company_input.strip())
+        brand = _KNOWN_BRANDS.get(cand.lower())
+        if brand is not None:
+            return ValidationResult(
+                company_input, brand, 0.95, "known_brand",
+                "Marque reconnue, validation locale.",
+            )
+        # cleaned name already contains the email-domain key: the LLM is
+        # very unlikely to change the answer, so skip it (unless strict)
+        if (
+            not settings.strict_validation
+            and domain_key
+            and domain_key in _alnum_key(cand)
+        ):
+            return ValidationResult(
+                company_input, cand, 0.85, "domain_match",
+                "Le nom nettoyé correspond au domaine email, validation locale.",
+            )
+        return None
 
-{
-    "nom_commercial": "Meta",
-    "confidence": 0.95,
-    "explication": "Nom officiel après changement en 2021.",
-    "changement_nom": true,
-    "entreprise_connue": true,
-    "citations": ["https://example.com"]
-}
+    @staticmethod
+    def _domain_lookup(company_input, domain_key: str) -> ValidationResult | None:
+        """Resolve well-known corporate email domains without any LLM call."""
+        brand = _DOMAIN_BRAND.get(domain_key or "")
+        if brand is None:
+            return None
+        return ValidationResult(
+            company_input, brand, 0.99, "domain_lookup",
+            f"Domaine email reconnu: '{domain_key}' correspond à {brand}.",
+        )
 
-If the company is not found, `nom_commercial` should be the cleaned input company name, `confidence` should be low (e.g., < 0.3), and `entreprise_connue` should be `false`.
-"""
-            },
-            {
-                "role": "user",
-                "content": (
-                    f'Entreprise: "{company_input}", '
-                    f'Domaine email: "{email_domain if email_domain and email_domain != "nan" else "Non fourni"}"'
-                )
-            }
-        ]
+    @llm_retry
+    async def _fast_validate(self, company_input_str: str, domain_key: str) -> dict:
+        """
+        First pass: a plain chat completion, no tools. Most rows resolve
+        here; the multi-second web-search call is reserved for companies
+        the model does not confidently recognise.
+        """
+        messages = (
+            _FAST_SYSTEM_MSG,
+            {"role": "user", "content": _USER_TMPL.format_map(
+                {"c": company_input_str, "d": domain_key or "Non fourni"})},
+        )
+        async with shared_sem:
+            resp = await asyncio.wait_for(
+                self._client.chat.completions.create(
+                    model=self._MODEL_FAST if self._cascade else self._MODEL,
+                    messages=messages,
+                    temperature=0.1,
+                    max_tokens=300,
+                    response_format=_COMPANY_SCHEMA_FORMAT,
+                ),
+                settings.openai_timeout,
+            )
+        data = orjson.loads(resp.choices[0].message.content)
+        logger.debug("fast validate: %s", data)
+        out = _LLMAnswer.model_validate(data)
+        return {"data": data, "explanation": out.explication, "urls": out.citations}
+
+    @llm_retry
+    async def _deep_validate(self, company_input_str: str, domain_key: str) -> dict:
+        """Second pass: the Responses API with the web-search preview tool."""
+        messages = (
+            *_DEEP_BASE_MESSAGES,
+            # company_input_str is the cleaned string version
+            {"role": "user", "content": _USER_TMPL.format_map(
+                {"c": company_input_str, "d": domain_key or "Non fourni"})},
+        )
 
-        try:
-            response = await self._client.responses.create(
-                model="gpt-4.1-mini",
+        raw_parts: list[str] = []
+        raw_txt = ""
+        # the timeout covers the whole stream: the web-search tool can stall
+        # mid-generation, which would otherwise pin a semaphore slot forever
+        async with shared_sem, asyncio.timeout(settings.openai_timeout):
+            # stream so parsing overlaps generation and we can stop as soon
+            # as the JSON object has closed, instead of waiting for the
+            # response (and any trailing tokens) to finish
+            async with self._client.responses.stream(
+                model=self._MODEL,
                 tools=[{
                     "type": "web_search_preview",
                     "user_location": {"type": "approximate", "country": "CH"},
                 }],
                 input=messages,
-            )
-
-            # === DÉBOGAGE : imprime la réponse brute ===
-            print("=== [DEBUG] response.output_text ===")
-            print(response.output_text)
-            # print("=== [DEBUG] response.output JSON blocks ===") # No longer have separate JSON blocks
-
-            data = {}
-            explanation = "Failed to parse LLM response or extract key information."
-            urls = []
-
-            try:
-                raw_txt = response.output_text.strip()
-                # Attempt to extract JSON even if there's leading/trailing text,
-                # though ideally the LLM returns JSON only as per the updated prompt.
-                match = re.search(r"```json\s*(\{.*?\})\s*```", raw_txt, re.DOTALL)
-                if match:
-                    json_str = match.group(1)
+            ) as stream:
+                async for event in stream:
+                    if event.type != "response.output_text.delta":
+                        continue
+                    raw_parts.append(event.delta)
+                    # only worth attempting a parse when a brace just closed
+                    if "}" in event.delta:
+                        candidate = "".join(raw_parts).strip()
+                        if self._try_parse(candidate) is not None:
+                            raw_txt = candidate
+                            break
                 else:
-                    # Assume the raw_txt is the JSON itself if no markdown block is found
-                    json_str = raw_txt
-
-                data = json.loads(json_str)
-                print("=== [DEBUG] JSON parsé ===")
-                print(data)
+                    raw_txt = "".join(raw_parts).strip()
 
-                explanation = data.get("explication", "Explication non fournie par l'IA.")
-                raw_citations = data.get("citations", [])
-                if isinstance(raw_citations, list):
-                    urls = [str(c) for c in raw_citations if isinstance(c, str)]
-                else:
-                    urls = [] # or handle as an error/warning
+        logger.debug("response raw text: %s", raw_txt)
 
-            except Exception as e:
-                print(f"[DEBUG] échec json.loads sur output_text: {e}")
-                # data remains {}
-                explanation = f"Erreur de parsing JSON: {e}"
+        data = self._try_parse(raw_txt)
+        if data is None:
+            logger.debug("échec du parsing JSON sur la réponse streamée")
+            return {
+                "data": {},
+                "explanation": "Erreur de parsing JSON: réponse de l'IA non parsable.",
+                "urls": [],
+            }
 
-            citation_str = ";".join(urls) if urls else ""
+        logger.debug("JSON parsé: %s", data)
+        out = _LLMAnswer.model_validate(data)
+        return {"data": data, "explanation": out.explication, "urls": out.citations}
 
-            if "nom_commercial" not in data or not data.get("nom_commercial"):
-                cleaned_name = self._basic_clean(company_input)
-                # Use a low, fixed confidence for this fallback.
-                # The 'unknown_flag' for _calibrate would be True. Domain match is False.
-                # Number of citations (urls) might be 0 if parsing failed before extracting them.
-                conf = self._calibrate(0.1, len(urls), False, True)
-                final_explanation = explanation if data else "Fallback: Nom nettoyé basiquement en raison d'une réponse invalide de l'IA."
-                if not data.get("nom_commercial") and "nom_commercial" in data : # specifically if nom_commercial was empty
-                    final_explanation = "Nom commercial non fourni par l'IA, utilisation du nom nettoyé."
+    @staticmethod
+    def _try_parse(raw_txt: str) -> dict | None:
+        """Return the JSON object contained in raw_txt, or None."""
+        if raw_txt.startswith("{"):
+            # bare JSON — the common case
+            json_str = raw_txt
+        else:
+            # fenced or prose-wrapped: slice the outermost {...} directly,
+            # two memchr-speed scans instead of a backtracking regex;
+            # orjson rejects a bad slice and we return None as before
+            start = raw_txt.find("{")
+            end = raw_txt.rfind("}")
+            json_str = raw_txt[start:end + 1] if 0 <= start < end else raw_txt
+        try:
+            data = orjson.loads(json_str)
+        except Exception:
+            return None
+        return data if isinstance(data, dict) else None
+
+    async def validate_many(
+        self, items: List[Tuple[str, str]]
+    ) -> List[ValidationResult]:
+        """
+        Validate many (company_input, domain_key) items in one LLM request.
+
+        One batched call replaces N independent `responses.create` round-trips;
+        falls back to per-item `validate` if the batched response is unusable.
+        """
+        if not items:
+            return []
+
+        if not self._client:
+            return [await self.validate(company, domain) for company, domain in items]
+
+        # resolve known domains and curated brands up front; only the rest hit the LLM
+        results: List[ValidationResult | None] = [None] * len(items)
+        pending: List[Tuple[int, Tuple[str, str]]] = []
+        for i, (company, domain) in enumerate(items):
+            hit = self._local_lookup(company, domain)
+            if hit is not None:
+                results[i] = hit
+            else:
+                pending.append((i, (company, domain)))
+        if not pending:
+            return results
+
+        inputs = json.dumps(
+            [
+                {
+                    "index": i,
+                    "entreprise": str(company) if company is not None else "",
+                    "domaine_email": domain or "Non fourni",
+                }
+                for i, (_, (company, domain)) in enumerate(pending)
+            ],
+            ensure_ascii=False,
+        )
+        messages = (
+            _BATCH_DEVELOPER_MSG,
+            {"role": "user", "content": f"Entreprises (tableau JSON indexé):\n{inputs}"},
+        )
 
-                print(f"[DEBUG] fallback basic clean → '{cleaned_name}', conf={conf}, explanation: {final_explanation}")
-                return ValidationResult(
-                    company_input, cleaned_name, conf,
-                    citation_str, final_explanation
+        @llm_retry
+        async def _call_llm():
+            async with shared_sem:
+                return await asyncio.wait_for(
+                    self._client.responses.create(
+                        model=self._MODEL,
+                        tools=[{
+                            "type": "web_search_preview",
+                            "user_location": {"type": "approximate", "country": "CH"},
+                        }],
+                        input=messages,
+                    ),
+                    settings.openai_timeout,
                 )
 
-            nom_final = data["nom_commercial"]
-            base_conf = float(data.get("confidence", 0.5)) # LLM's self-assessed confidence
-
-            # Signaux additionnels pour calibration
-            # urls list is already populated from JSON data's "citations"
-            domain = re.sub(r"[^a-z0-9]", "",
-                            (email_domain or "").lower().split("@")[-1].split(".")[0])
-            # Check if the (cleaned) domain appears in the (cleaned) final name
-            cleaned_nom_final_for_domain_check = re.sub(r"[^a-z0-9]", "", nom_final.lower())
-            domain_ok = bool(domain and domain in cleaned_nom_final_for_domain_check)
-
-            # `entreprise_connue` comes from the JSON, default to True if missing (conservative)
-            # but prompt now guides LLM to set this, if it's missing, it's more likely an issue.
-            # Let's default to unknown (True for unknown_flag) if not present.
-            unknown_flag = not data.get("entreprise_connue", False) # If 'entreprise_connue':false, unknown_flag = true
+        try:
+            response = await _call_llm()
+            data = self._try_parse(response.output_text.strip())
+            if data is None:
+                raise ValueError("réponse batch non parsable en JSON")
+            entries = data.get("results", [])
+            by_index = {}
+            for pos, entry in enumerate(entries):
+                if isinstance(entry, dict):
+                    by_index[int(entry.get("index", pos))] = entry
+
+            for i, (orig_idx, (company, domain)) in enumerate(pending):
+                entry = by_index.get(i)
+                if entry is None or not entry.get("nom_commercial"):
+                    # same behaviour as the single-item path when the LLM
+                    # does not produce a usable trade name
+                    results[orig_idx] = await self.validate(company, domain)
+                    continue
+
+                out = _LLMAnswer.model_validate(entry)
+                domain_ok = bool(domain and domain in _alnum_key(out.nom_commercial))
+                confidence = self._calibrate(out.confidence, len(out.citations),
+                                             domain_ok, not out.entreprise_connue)
+                results[orig_idx] = ValidationResult(
+                    company, out.nom_commercial, confidence,
+                    ";".join(out.citations), out.explication
+                )
+            return results
 
-            confidence = self._calibrate(base_conf, len(urls), domain_ok, unknown_flag)
-            return ValidationResult(company_input, nom_final, confidence, citation_str, explanation)
+        except Exception as e:
+            logger.error("Company LLM batch error (%d items): %s", len(pending), e, exc_info=True)
+            # degrade to one call per item rather than failing the whole batch
+            for orig_idx, (company, domain) in pending:
+                results[orig_idx] = await self.validate(company, domain)
+            return results
+
+    async def validate_batch_offline(
+        self, items: List[Tuple[str, str]], poll_interval: float = 30.0
+    ) -> List[ValidationResult]:
+        """
+        Validate items through the OpenAI Batch API: ~50% of the real-time
+        cost, no rate-limit pressure, but up to 24h turnaround. Meant for
+        bulk pipeline runs where row latency is irrelevant.
+
+        Rows the batch job does not resolve (and the whole batch, if the
+        job fails) fall back to the real-time path.
+        """
+        if not items:
+            return []
+        if not self._client:
+            return [await self.validate(company, domain) for company, domain in items]
+
+        # locally resolvable rows never need the API, batch or otherwise
+        results: List[ValidationResult | None] = [None] * len(items)
+        pending: List[Tuple[int, Tuple[str, str]]] = []
+        for i, (company, domain) in enumerate(items):
+            hit = self._local_lookup(company, domain)
+            if hit is not None:
+                results[i] = hit
+            else:
+                pending.append((i, (company, domain)))
+        # a fully locally-resolved chunk must not create an empty Batch
+        # job (30s+ poll stall and a junk file on the account)
+        if not pending:
+            return results
+
+        lines = []
+        for orig_idx, (company, domain) in pending:
+            lines.append(json.dumps({
+                "custom_id": str(orig_idx),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self._MODEL,
+                    "messages": [
+                        _FAST_SYSTEM_MSG,
+                        {
+                            "role": "user",
+                            "content": (
+                                f'Entreprise: "{str(company) if company is not None else ""}", '
+                                f'Domaine email: "{domain or "Non fourni"}"'
+                            ),
+                        },
+                    ],
+                    "temperature": 0.1,
+                    "max_tokens": 300,
+                    "response_format": _COMPANY_SCHEMA_FORMAT,
+                },
+            }, ensure_ascii=False))
 
+        try:
+            upload = await self._client.files.create(
+                file=("batch_input.jsonl", ("\n".join(lines) + "\n").encode()),
+                purpose="batch",
+            )
+            job = await self._client.batches.create(
+                input_file_id=upload.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+            logger.info("Batch %s créé (%d items), polling toutes les %.0fs",
+                        job.id, len(pending), poll_interval)
+            while job.status not in ("completed", "failed", "expired", "cancelled"):
+                await asyncio.sleep(poll_interval)
+                job = await self._client.batches.retrieve(job.id)
+            if job.status != "completed" or not job.output_file_id:
+                raise RuntimeError(f"batch {job.id} terminé en statut {job.status}")
+
+            raw = (await self._client.files.content(job.output_file_id)).content
+            for line in raw.splitlines():
+                if not line.strip():
+                    continue
+                rec = orjson.loads(line)
+                idx = int(rec["custom_id"])
+                body = (rec.get("response") or {}).get("body") or {}
+                choices = body.get("choices") or []
+                if not choices:
+                    continue
+                data = self._try_parse((choices[0]["message"]["content"] or "").strip())
+                if data is None or not data.get("nom_commercial"):
+                    continue            # resolved by the fallback loop below
+                company, domain = items[idx]
+                out = _LLMAnswer.model_validate(data)
+                domain_ok = bool(domain and domain in _alnum_key(out.nom_commercial))
+                confidence = self._calibrate(out.confidence, len(out.citations),
+                                             domain_ok, not out.entreprise_connue)
+                results[idx] = ValidationResult(
+                    company, out.nom_commercial, confidence,
+                    ";".join(out.citations), out.explication
+                )
         except Exception as e:
-            logger.error("Company LLM error during validation call for '%s': %s", company_input, e, exc_info=True)
-            cleaned = self._basic_clean(company_input)
-            return ValidationResult(company_input, cleaned, 0.3, "error", "exception fallback")
+            logger.error("Company Batch API error (%d items): %s", len(pending), e, exc_info=True)
+
+        # anything the batch left unresolved goes through the real-time path
+        for orig_idx, (company, domain) in pending:
+            if results[orig_idx] is None:
+                results[orig_idx] = await self.validate(company, domain)
+        return results
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def _calibrate(conf: float, citations: int, domain_match: bool, unknown_flag: bool) -> float:
-        bonus = min(citations, 4) * 0.025
-        if domain_match:
-            bonus += 0.1
+        # pure function over a small discrete input space (LLM confidences
+        # cluster on round values, citations capped at 4, two booleans), so
+        # repeats across a CSV are a dict hit.
+        # integer basis points: no math.ceil/min/max lookups, and exact
+        # rounding — the float version's 0.025-steps sometimes landed on
+        # 0.15000000000000002 and ceiled one centime too high
+        pts = round(conf * 10000)
         if unknown_flag:
-            conf *= 0.3
-        raw = min(max(conf + bonus, 0), 1)
+            pts = pts * 3 // 10
+        pts += (citations if citations < 4 else 4) * 250
+        if domain_match:
+            pts += 1000
+        pts = 0 if pts < 0 else 10000 if pts > 10000 else pts
         # arrondi au centième supérieur
-        return math.ceil(raw * 100) / 100
+        return ((pts + 99) // 100) / 100
 
     @staticmethod
     def _basic_clean(name: str) -> str:
-        patterns = [
-            r"\s+(SARL|SAS|SA|SASU|EURL|SNC|SCI|SCP|SCOP|SEL|SELARL|SELAS|SELASU)",
-            r"\s+(AG|GmbH|KG|OHG|GbR|UG)",
-            r"\s+(Ltd|Limited|LLC|Inc|Incorporated|Corp|Corporation|Company|Co\.?)",
-            r"\s+(BV|NV|VOF|CV)",
-            r"\s+(SpA|Srl|Snc|Sas)",
-            r"\s+(AB|HB|KB)",
-            r"[,\s]+(®|™|©)",
-            r"\s*\([^)]+\)$",
-        ]
-        cleaned = name.strip()
-        for pat in patterns:
-            cleaned = re.sub(pat, "", cleaned, flags=re.IGNORECASE)
-        return " ".join(cleaned.split()) or name
+        return _basic_clean(name)
+
+    @classmethod
+    def basic_clean_series(cls, s: pd.Series) -> pd.Series:
+        """
+        Vectorized `_basic_clean` over a whole column: the same regex passes
+        run once in pandas' C string machinery instead of one Python
+        re.sub chain per row. Rows that clean down to nothing keep their
+        original value, matching the scalar function.
+        """
+        src = s.fillna("").astype(str).str.strip()
+        cleaned = (
+            src
+            .str.replace(_PAREN_RE, "", regex=True)
+            .str.replace(_TM_RE, "", regex=True)
+            .str.replace(_SUFFIX_RE, "", regex=True)
+            .str.split().str.join(" ")
+        )
+        return cleaned.where(cleaned != "", src)
@@ -1,18 +1,19 @@
 """
 Orchestrates the validators and CSV IO.
-Supports parallel rows processing with asyncio.gather.
+Streams the input CSV in chunks and processes batches in parallel with
+asyncio.gather, so memory stays flat regardless of file size.
 """
 
 from __future__ import annotations
 
-import asyncio, time
+import asyncio
 from pathlib import Path
 import pandas as pd
-from prospect_cleaner.settings import settings
+from prospect_cleaner.settings import settings, shared_sem
 from prospect_cleaner.logconf import logger
 from prospect_cleaner.services.name_validator import NameValidator
 from prospect_cleaner.services.company_validator import CompanyValidator
-from prospect_cleaner.utils.csv_utils import read_csv, write_csv
+from prospect_cleaner.utils.csv_utils import read_csv_chunks, chunk_writer_for
 
 class ProspectDataCleaner:
     def __init__(
@@ -21,73 +22,157 @@ class ProspectDataCleaner:
         prenom_col: str = settings.default_prenom_col,
         entreprise_col: str = settings.default_entreprise_col,
         email_col: str = settings.default_email_col,
+        use_batch_api: bool = False,
     ) -> None:
         self.name_validator    = NameValidator()
         self.company_validator = CompanyValidator()
-        self.sem = asyncio.Semaphore(settings.max_concurrency)
         self.nom_col = nom_col
         self.prenom_col = prenom_col
         self.entreprise_col = entreprise_col
         self.email_col = email_col
+        # defer company validation to the OpenAI Batch API (~50% cost,
+        # up to 24h turnaround) instead of real-time batched calls
+        self.use_batch_api = use_batch_api
 
-    async def _process_row(self, row_idx: int, row, df: pd.DataFrame) -> None:
+    @staticmethod
+    def _dedupe(inputs: list[tuple]) -> tuple[list[tuple], list[int]]:
         """
-        One row = one task.  We guard the LLM calls with a semaphore.
+        Collapse duplicate inputs (same company across many rows, repeated
+        name pairs). Returns the order-preserved unique inputs plus, for
+        each original row, its position in that unique list.
         """
-        async with self.sem:
-            email = row.get(self.email_col, "")
-            # Updated to receive three values from name_validator and pass email
-            n_res, p_res, name_expl = await self.name_validator.validate(
-                row[self.nom_col], row[self.prenom_col], email
-            )
-
-            if isinstance(email, str) and "@" in email:
-                domain = email.split("@")[-1]
-            else:
-                domain = ""
+        seen: dict[tuple, int] = {}
+        uniques: list[tuple] = []
+        positions: list[int] = []
+        for item in inputs:
+            key = tuple(str(part).strip().casefold() for part in item)
+            pos = seen.get(key)
+            if pos is None:
+                pos = seen[key] = len(uniques)
+                uniques.append(item)
+            positions.append(pos)
+        return uniques, positions
 
-            c_res = await self.company_validator.validate(
-                row[self.entreprise_col], domain
-            )
+    async def _run_batches(self, validate_many, inputs: list[tuple]) -> list:
+        """
+        Fan a list of inputs out as batched LLM requests of
+        `settings.batch_size` items. Concurrency is gated inside the
+        validators by the shared AIMD limiter — a second fixed gate here
+        would pin inflight calls at max_concurrency and defeat its additive
+        increase. Batches are materialized in windows sized from the
+        limiter's current limit so we never hold coroutine/future state for
+        the whole input at once, while always fanning out enough work to
+        let the limit grow.
+        """
+        results: list = [None] * len(inputs)
 
-        # update dataframe in‑place
-        df.at[row_idx, f"{self.nom_col}_valide"]          = n_res.validated
-        df.at[row_idx, f"{self.prenom_col}_valide"]       = p_res.validated
-        df.at[row_idx, f"{self.entreprise_col}_validee"]  = c_res.validated
+        async def _run(start: int, batch: list[tuple]) -> None:
+            results[start:start + len(batch)] = await validate_many(batch)
 
-        df.at[row_idx, "confiance_nom"]        = n_res.confidence
-        df.at[row_idx, "confiance_prenom"]     = p_res.confidence
-        df.at[row_idx, "confiance_entreprise"] = c_res.confidence
-        df.at[row_idx, "entreprise_citations"] = c_res.source
-        df.at[row_idx, "entreprise_explication"] = c_res.explanation
-        df.at[row_idx, "name_explication"]     = name_expl # Added new column
-        df.at[row_idx, "source_validation"]    = f"nom:{n_res.source}"
+        starts = range(0, len(inputs), settings.batch_size)
+        w = 0
+        while w < len(starts):
+            # re-read per window: the limit moves as the AIMD gate adapts
+            window = shared_sem.limit * 4
+            await asyncio.gather(*(
+                _run(start, inputs[start:start + settings.batch_size])
+                for start in starts[w:w + window]
+            ))
+            w += window
+        return results
 
+    def _normalize_inputs(self, df: pd.DataFrame) -> None:
+        """
+        Strip whitespace and fill NaN on the input columns in one vectorized
+        pass, instead of (x or "").strip() per scalar in the validators.
+        Arrow-backed strings keep the column in contiguous UTF-8 buffers, so
+        this pass (and the later .str ops on these columns) runs in Arrow's
+        C++ compute kernels rather than object-by-object in Python.
+        """
+        for col in (self.nom_col, self.prenom_col, self.entreprise_col, self.email_col):
+            if col in df.columns:
+                df[col] = df[col].astype("string[pyarrow]").str.strip().fillna("")
 
-    async def _save_loop(self, df: pd.DataFrame, out: Path) -> None:
+    async def _process_chunk(self, df: pd.DataFrame) -> None:
         """
-        Every `batch_size` rows or 10 s (whichever first) we save to disk.
+        Validate every row of a chunk: dedupe inputs, dispatch batched LLM
+        requests over the uniques only, then map results back to the rows.
         """
-        last_save, processed = time.time(), 0
-        while True:
-            await asyncio.sleep(1)
-            new_processed = (df["source_validation"] != "").sum()
-            if new_processed - processed >= settings.batch_size or time.time() - last_save > 10:
-                await write_csv(df, out)
-                processed, last_save = new_processed, time.time()
-            if new_processed == len(df):
-                await write_csv(df, out)   # final flush
-                return
+        noms        = df[self.nom_col].tolist()
+        prenoms     = df[self.prenom_col].tolist()
+        entreprises = df[self.entreprise_col].tolist()
+        if self.email_col in df.columns:
+            emails = df[self.email_col].tolist()
+            # normalized first label of the email domain ("hublead" for
+            # jane@hublead.ch), computed once vectorized instead of a
+            # regex per row inside the validator
+            domain_keys = (
+                df[self.email_col]
+                .str.extract(r"@([^.@]+)", expand=False)
+                .fillna("")
+                .str.lower()
+                .str.replace(r"[^a-z0-9]", "", regex=True)
+                .tolist()
+            )
+        else:
+            emails = [""] * len(df)
+            domain_keys = [""] * len(df)
 
-    async def clean(
-        self,
-        input_path: str | Path,
-        output_path: str | Path,
-    ) -> None:
-        df = read_csv(input_path)
+        name_inputs = list(zip(noms, prenoms, emails))
+        company_inputs = list(zip(entreprises, domain_keys))
+
+        uniq_names, name_pos = self._dedupe(name_inputs)
+        uniq_companies, company_pos = self._dedupe(company_inputs)
+        logger.info("Chunk: %d rows → %d unique names, %d unique companies",
+                    len(df), len(uniq_names), len(uniq_companies))
+
+        if self.use_batch_api:
+            # one Batch API job per validator per chunk; the two jobs are
+            # submitted together and polled concurrently
+            name_task = self.name_validator.validate_batch_offline(uniq_names)
+            company_task = self.company_validator.validate_batch_offline(uniq_companies)
+        else:
+            name_task = self._run_batches(
+                self.name_validator.validate_many, uniq_names
+            )
+            company_task = self._run_batches(
+                self.company_validator.validate_many, uniq_companies
+            )
+        name_results, company_results = await asyncio.gather(name_task, company_task)
+
+        # collect results into plain lists and assign whole columns at the
+        # end: ~10 scalar df.at setitems per row each re-enter the pandas
+        # indexing machinery, whereas a full-column assignment is one call
+        n_valide, p_valide, e_validee = [], [], []
+        conf_nom, conf_prenom, conf_ent = [], [], []
+        citations, ent_expl, nom_expl, sources = [], [], [], []
+        for n_pos, c_pos in zip(name_pos, company_pos):
+            n_res, p_res, name_expl = name_results[n_pos]
+            c_res = company_results[c_pos]
+            n_valide.append(n_res.validated)
+            p_valide.append(p_res.validated)
+            e_validee.append(c_res.validated)
+            conf_nom.append(n_res.confidence)
+            conf_prenom.append(p_res.confidence)
+            conf_ent.append(c_res.confidence)
+            citations.append(c_res.source)
+            ent_expl.append(c_res.explanation)
+            nom_expl.append(name_expl)
+            sources.append(f"nom:{n_res.source}")
+
+        df[f"{self.nom_col}_valide"]         = n_valide
+        df[f"{self.prenom_col}_valide"]      = p_valide
+        df[f"{self.entreprise_col}_validee"] = e_validee
+        df["confiance_nom"]          = conf_nom
+        df["confiance_prenom"]       = conf_prenom
+        df["confiance_entreprise"]   = conf_ent
+        df["entreprise_citations"]   = citations
+        df["entreprise_explication"] = ent_expl
+        df["name_explication"]       = nom_expl
+        df["source_validation"]      = sources
 
-        # ensure all result columns are present
-        result_cols = {
+    def _result_columns(self) -> dict:
+        return {
             f"{self.nom_col}_valide":        "",
             f"{self.prenom_col}_valide":     "",
             f"{self.entreprise_col}_validee": "",
@@ -96,70 +181,116 @@ class ProspectDataCleaner:
             "confiance_entreprise":  0.0,
             "entreprise_citations":  "",
             "entreprise_explication":"",
-            "name_explication":      "", # Added new column default
+            "name_explication":      "",
             "source_validation":     "",
         }
-        for col, default in result_cols.items():
-            if col not in df.columns:
-                df[col] = default
-
-        tasks = [
-            self._process_row(idx, df.iloc[idx].copy(), df)
-            for idx in df.index
-        ]
-
-        saver = asyncio.create_task(self._save_loop(df, output_path))
-        await asyncio.gather(*tasks)
-        await saver
+
+    async def clean(
+        self,
+        input_path: str | Path,
+        output_path: str | Path,
+    ) -> None:
+        stats = self._new_stats()
+        # .parquet output paths get the columnar writer, anything else CSV
+        writer = chunk_writer_for(output_path)
+        pending_write: asyncio.Task | None = None
+
+        for chunk in read_csv_chunks(input_path, settings.chunk_size):
+            df = chunk.reset_index(drop=True)
+            self._normalize_inputs(df)
+
+            # ensure all result columns are present
+            for col, default in self._result_columns().items():
+                if col not in df.columns:
+                    df[col] = default
+
+            await self._process_chunk(df)
+
+            self._update_stats(df, stats)
+
+            # overlap this chunk's disk write with the next chunk's LLM calls
+            if pending_write is not None:
+                await pending_write
+            pending_write = asyncio.create_task(writer.write_chunk(df))
+
+        if pending_write is not None:
+            await pending_write
+        await writer.close()
         logger.info("Cleaning finished (%s → %s)", input_path, output_path)
 
         # 🚀 Affiche le résumé en console
-        self._print_summary(df)
+        self._print_summary(stats)
 
+    # ------------------------------------------------------------------ #
+    # Summary (aggregated across chunks so nothing has to stay in memory)
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _new_stats() -> dict:
+        return {
+            "total": 0, "processed": 0,
+            "nom_corr": 0, "prenom_corr": 0, "ent_corr": 0,
+            "conf_nom_sum": 0.0, "conf_prenom_sum": 0.0, "conf_ent_sum": 0.0,
+            "ex_noms": [], "ex_ent": [],
+        }
 
-    def _print_summary(self, df: pd.DataFrame) -> None:
-        """Affiche un résumé des traitements en console."""
-        total = len(df)
+    def _update_stats(self, df: pd.DataFrame, stats: dict) -> None:
+        stats["total"] += len(df)
         processed = df[df["source_validation"] != ""]
         cnt = len(processed)
-
         if cnt == 0:
-            print("\n=== AUCUNE LIGNE TRAITÉE ===")
             return
+        stats["processed"] += cnt
+
+        nom_diff = processed[self.nom_col] != processed[f"{self.nom_col}_valide"]
+        ent_diff = processed[self.entreprise_col] != processed[f"{self.entreprise_col}_validee"]
+        stats["nom_corr"]    += nom_diff.sum()
+        stats["prenom_corr"] += (processed[self.prenom_col] != processed[f"{self.prenom_col}_valide"]).sum()
+        stats["ent_corr"]    += ent_diff.sum()
+
+        stats["conf_nom_sum"]    += processed["confiance_nom"].sum()
+        stats["conf_prenom_sum"] += processed["confiance_prenom"].sum()
+        stats["conf_ent_sum"]    += processed["confiance_entreprise"].sum()
 
-        # Corrections appliquées
-        nom_corr = (processed[self.nom_col] != processed[f"{self.nom_col}_valide"]).sum()
-        prenom_corr = (processed[self.prenom_col] != processed[f"{self.prenom_col}_valide"]).sum()
-        ent_corr = (processed[self.entreprise_col] != processed[f"{self.entreprise_col}_validee"]).sum()
+        # keep the first few examples across the whole run
+        for _, row in processed[nom_diff].head(3).iterrows():
+            if len(stats["ex_noms"]) < 3:
+                stats["ex_noms"].append(
+                    (row[self.nom_col], row[f"{self.nom_col}_valide"], row["confiance_nom"])
+                )
+        for _, row in processed[ent_diff].head(3).iterrows():
+            if len(stats["ex_ent"]) < 3:
+                stats["ex_ent"].append(
+                    (row[self.entreprise_col], row[f"{self.entreprise_col}_validee"],
+                     row["confiance_entreprise"])
+                )
 
-        # Moyennes de confiance
-        avg_nom = processed["confiance_nom"].mean()
-        avg_prenom = processed["confiance_prenom"].mean()
-        avg_ent = processed["confiance_entreprise"].mean()
+    def _print_summary(self, stats: dict) -> None:
+        """Affiche un résumé des traitements en console."""
+        total, cnt = stats["total"], stats["processed"]
+
+        if cnt == 0:
+            print("\n=== AUCUNE LIGNE TRAITÉE ===")
+            return
 
         print("\n=== RÉSUMÉ DU TRAITEMENT ===")
         print(f"Total lignes dans le fichier: {total}")
         print(f"Lignes traitées: {cnt}")
-        print(f"Corrections noms: {nom_corr} ({nom_corr/cnt*100:.1f}%)")
-        print(f"Corrections prénoms: {prenom_corr} ({prenom_corr/cnt*100:.1f}%)")
-        print(f"Corrections entreprises: {ent_corr} ({ent_corr/cnt*100:.1f}%)")
-        print(f"Confiance moyenne - Noms: {avg_nom:.2f}")
-        print(f"Confiance moyenne - Prénoms: {avg_prenom:.2f}")
-        print(f"Confiance moyenne - Entreprises: {avg_ent:.2f}")
+        print(f"Corrections noms: {stats['nom_corr']} ({stats['nom_corr']/cnt*100:.1f}%)")
+        print(f"Corrections prénoms: {stats['prenom_corr']} ({stats['prenom_corr']/cnt*100:.1f}%)")
+        print(f"Corrections entreprises: {stats['ent_corr']} ({stats['ent_corr']/cnt*100:.1f}%)")
+        print(f"Confiance moyenne - Noms: {stats['conf_nom_sum']/cnt:.2f}")
+        print(f"Confiance moyenne - Prénoms: {stats['conf_prenom_sum']/cnt:.2f}")
+        print(f"Confiance moyenne - Entreprises: {stats['conf_ent_sum']/cnt:.2f}")
 
         # Exemples
         print("\n=== EXEMPLES DE CORRECTIONS ===")
 
-        # Noms
-        ex_noms = processed[processed[self.nom_col] != processed[f"{self.nom_col}_valide"]].head(3)
-        if not ex_noms.empty:
+        if stats["ex_noms"]:
             print("\nCorrections de noms:")
-            for _, row in ex_noms.iterrows():
-                print(f"  {row[self.nom_col]} → {row[f'{self.nom_col}_valide']} (confiance: {row['confiance_nom']:.2f})")
+            for original, valide, conf in stats["ex_noms"]:
+                print(f"  {original} → {valide} (confiance: {conf:.2f})")
 
-        # Entreprises
-        ex_ent = processed[processed[self.entreprise_col] != processed[f"{self.entreprise_col}_validee"]].head(3)
-        if not ex_ent.empty:
+        if stats["ex_ent"]:
             print("\nCorrections d'entreprises:")
-            for _, row in ex_ent.iterrows():
-                print(f"  {row[self.entreprise_col]} → {row[f'{self.entreprise_col}_validee']} (confiance: {row['confiance_entreprise']:.2f})")
+            for original, validee, conf in stats["ex_ent"]:
+                print(f"  {original} → {validee} (confiance: {conf:.2f})")
@@ -1,7 +1,11 @@
 import os
+import httpx
 from dotenv import load_dotenv
+from openai import AsyncOpenAI
 from pydantic_settings import BaseSettings
 
+from prospect_cleaner.utils.async_utils import AimdLimiter
+
 load_dotenv()  # load .env
 
 class _Settings(BaseSettings):
@@ -16,11 +20,48 @@ class _Settings(BaseSettings):
     default_email_col: str      = "email"
 
     # Runtime
-    batch_size: int = 10          # rows per save
+    batch_size: int = 10          # rows per LLM request
+    chunk_size: int = 10_000      # rows per CSV chunk held in memory
     max_concurrency: int = 5      # parallel tasks
+    strict_validation: bool = False  # skip local heuristics, always ask the LLM
+    openai_timeout: float = 45.0  # seconds per LLM call before the local fallback
+    openai_model: str = "gpt-4.1-mini"       # escalation / batch model
+    openai_model_fast: str = "gpt-4.1-nano"  # cascade first-pass model
 
     class Config:
         env_file = ".env"
         case_sensitive = False
 
 settings = _Settings()           # singleton
+
+# Shared across all validators: one client = one warm httpx connection pool
+# (instead of a fresh pool per validator instance), one semaphore = a global
+# gate on concurrent OpenAI calls so bursts stay under the RPM limit.
+# HTTP/2 multiplexes the concurrent batch calls over a single TCP+TLS
+# connection instead of one handshake per in-flight request.
+shared_client = (
+    AsyncOpenAI(
+        api_key=settings.openai_api_key,
+        http_client=httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=64),
+            # fail fast on dead connections, leave room for slow completions
+            timeout=httpx.Timeout(60.0, connect=5.0),
+        ),
+    )
+    if settings.openai_api_key else None
+)
+# AIMD gate instead of a fixed semaphore: starts at max_concurrency, grows
+# one slot per clean window of calls and halves on a 429, so throughput
+# adapts to the account's actual rate limit instead of a static guess.
+shared_sem = AimdLimiter(settings.max_concurrency)
+
+
+async def aclose_shared_client() -> None:
+    """
+    Close the shared client's connection pool. Call once at process
+    shutdown (FastAPI shutdown hook, end of a CLI run) so keep-alive
+    connections are torn down cleanly instead of leaking until GC.
+    """
+    if shared_client is not None:
+        await shared_client.close()
@@ -1,13 +1,94 @@
 import asyncio
 from functools import wraps
 
+import openai
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+# Retry transient OpenAI failures (429/5xx/timeout/connection) with jittered
+# exponential backoff instead of dropping the row into the error fallback.
+# Anything else — and the fifth consecutive failure — still propagates to
+# the caller's fallback path.
+llm_retry = retry(
+    wait=wait_random_exponential(min=1, max=30),
+    stop=stop_after_attempt(5),
+    retry=retry_if_exception_type(
+        (
+            openai.RateLimitError,
+            openai.APITimeoutError,
+            openai.APIConnectionError,
+            openai.InternalServerError,
+        )
+    ),
+    reraise=True,
+)
+
+class AimdLimiter:
+    """
+    Additive-increase / multiplicative-decrease concurrency gate, a drop-in
+    for the asyncio.Semaphore that used to cap OpenAI calls.
+
+    A fixed cap either wastes headroom on high-tier accounts or slams into
+    429s on small ones. This limiter probes instead: after a full window of
+    successful calls the inflight limit grows by one; the moment a call
+    exits with RateLimitError the limit halves (TCP-style AIMD), so
+    sustained throughput converges on whatever the account's rate limit
+    actually allows.
+
+    Usage is identical to a semaphore: ``async with limiter: ...``. The
+    error observation happens in __aexit__, so the LLM call itself must run
+    inside the ``async with`` block (which all call sites already do).
+    """
+
+    def __init__(self, start: int, floor: int = 1, ceiling: int = 64) -> None:
+        self._limit = start
+        self._floor = floor
+        self._ceiling = ceiling
+        self._inflight = 0
+        self._successes = 0
+        self._cond = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    async def __aenter__(self) -> "AimdLimiter":
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._inflight < self._limit)
+            self._inflight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        async with self._cond:
+            self._inflight -= 1
+            if exc_type is not None and issubclass(exc_type, openai.RateLimitError):
+                # multiplicative decrease: back off hard, the account's
+                # request budget is exhausted right now
+                self._limit = max(self._floor, self._limit // 2)
+                self._successes = 0
+            elif exc_type is None:
+                # additive increase: one extra slot per clean window
+                self._successes += 1
+                if self._successes >= self._limit and self._limit < self._ceiling:
+                    self._limit += 1
+                    self._successes = 0
+            self._cond.notify_all()
+
+
 def run_sync(fn):
     """
-    Decorator: run a (possibly) blocking func in default executor
+    Decorator: run a (possibly) blocking func via asyncio.to_thread
     so we can 'await' disk writes without blocking the loop.
+
+    Dispatch to a thread costs more than a small syscall: wrap one
+    coarse sync helper (open + write + close in a single function), and
+    keep cheap calls like stat()/exists() synchronous.
     """
     @wraps(fn)
     async def wrapper(*args, **kwargs):
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, fn, *args, **kwargs)
+        return await asyncio.to_thread(fn, *args, **kwargs)
     return wrapper
@@ -0,0 +1,151 @@
+import asyncio
+import json
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+from prospect_cleaner.logconf import logger
+
+_CACHE_DIR = Path("data/.llm_cache")
+
+
+class LLMCache:
+    """
+    Async memo-cache for LLM results.
+
+    • in-memory LRU answers repeats within a run without touching the API
+    • concurrent calls for the same key are coalesced onto one in-flight future
+    • a sqlite store under data/.llm_cache/ survives the process, so reruns
+      of the same CSV skip the API entirely
+    """
+
+    def __init__(self, name: str = "llm_cache", maxsize: int = 4096) -> None:
+        self._maxsize = maxsize
+        self._mem: OrderedDict[str, Any] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._db_path = _CACHE_DIR / f"{name}.sqlite"
+        self._conn: sqlite3.Connection | None = None
+        self._disk_ok = True          # flipped off if sqlite init fails
+
+    # ------------------------------------------------------------------ #
+    # Disk layer (best-effort: a broken store must never break validation)
+    # get_or_create runs these via asyncio.to_thread — the per-put commit
+    # is an fsync, which must not stall the event loop
+    # ------------------------------------------------------------------ #
+    def _ensure_conn(self) -> sqlite3.Connection | None:
+        if self._conn is None and self._disk_ok:
+            try:
+                self._db_path.parent.mkdir(parents=True, exist_ok=True)
+                # accessed from to_thread workers; the sqlite3 module
+                # serializes access, so sharing the handle is safe
+                self._conn = sqlite3.connect(self._db_path, check_same_thread=False)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT)"
+                )
+                self._conn.commit()
+            except Exception as exc:
+                logger.warning("LLM disk cache disabled: %s", exc)
+                self._disk_ok = False
+        return self._conn
+
+    def _disk_get(self, key: str) -> Any | None:
+        conn = self._ensure_conn()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+            return json.loads(row[0]) if row else None
+        except Exception as exc:
+            logger.warning("LLM disk cache read failed: %s", exc)
+            return None
+
+    def _disk_put(self, key: str, value: Any) -> None:
+        conn = self._ensure_conn()
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)",
+                (key, json.dumps(value, ensure_ascii=False)),
+            )
+            conn.commit()
+        except Exception as exc:
+            logger.warning("LLM disk cache write failed: %s", exc)
+
+    # ------------------------------------------------------------------ #
+    # Memory layer
+    # ------------------------------------------------------------------ #
+    def _mem_get(self, key: str) -> Any | None:
+        if key in self._mem:
+            self._mem.move_to_end(key)
+            return self._mem[key]
+        return None
+
+    def _mem_put(self, key: str, value: Any) -> None:
+        self._mem[key] = value
+        self._mem.move_to_end(key)
+        while len(self._mem) > self._maxsize:
+            self._mem.popitem(last=False)
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+    def clear(self) -> None:
+        """Drop every cached entry, in memory and on disk."""
+        self._mem.clear()
+        conn = self._ensure_conn()
+        if conn is not None:
+            try:
+                conn.execute("DELETE FROM cache")
+                conn.commit()
+            except Exception as exc:
+                logger.warning("LLM disk cache clear failed: %s", exc)
+
+    async def get_or_create(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        cache_if: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        """
+        Return the cached value for `key`, or await `factory()` to produce it.
+
+        The value must be JSON-serialisable (it is persisted to sqlite).
+        `cache_if` can veto storing a result (e.g. an LLM fallback answer)
+        while still returning it to the caller.
+        """
+        hit = self._mem_get(key)
+        if hit is not None:
+            return hit
+
+        hit = await asyncio.to_thread(self._disk_get, key)
+        if hit is not None:
+            self._mem_put(key, hit)
+            return hit
+
+        # coalesce concurrent requests for the same key onto one future
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        loop = asyncio.get_running_loop()
+        fut: asyncio.Future = loop.create_future()
+        self._inflight[key] = fut
+        try:
+            value = await factory()
+        except BaseException as exc:
+            fut.set_exception(exc)
+            # waiters got the exception; don't let the loop warn about it
+            fut.exception()
+            raise
+        else:
+            fut.set_result(value)
+            if cache_if is None or cache_if(value):
+                self._mem_put(key, value)
+                await asyncio.to_thread(self._disk_put, key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+
+llm_cache = LLMCache()               # shared across validators